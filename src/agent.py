@@ -2,26 +2,416 @@
 Core agent functionality for the shipment tracking application.
 """
 
+import asyncio
+import contextlib
+import functools
+import io
 import logging
-from typing import Optional
-from semantic_kernel import Kernel
-from semantic_kernel.agents import ChatCompletionAgent, ChatHistoryAgentThread
-from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
-from semantic_kernel.contents import ChatMessageContent, FunctionCallContent, FunctionResultContent
-from semantic_kernel.filters.filter_types import FilterTypes
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
 from config import Config
-from filters import VerboseFunctionFilter
-from plugins import ShipmentTrackingPlugin
+from filters import VerboseFunctionFilter, verbose_function_logging
+from utils import SemanticCache, TTLCache
+
+# Semantic Kernel, openai and httpx take a noticeable time to import, so they
+# are imported where they are first needed. This keeps the CLI responsive
+# until the agent is actually set up.
+if TYPE_CHECKING:
+    import aiohttp
+    import numpy as np
+    from openai import AsyncAzureOpenAI
+    from semantic_kernel import Kernel
+    from semantic_kernel.agents import ChatCompletionAgent, ChatHistoryAgentThread
+    from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
+    from semantic_kernel.connectors.ai.open_ai import AzureTextEmbedding
+    from semantic_kernel.contents import ChatMessageContent
+    
+    from plugins import ShipmentTrackingPlugin
 
 logger = logging.getLogger(__name__)
 
+# Streamed tokens are written to stdout in batches: a flush happens once this
+# many characters are pending or this many seconds passed since the last one.
+STREAM_FLUSH_CHARS = 8192
+STREAM_FLUSH_INTERVAL = 0.025
+
+# The conversation history is truncated to Config.MAX_HISTORY_MESSAGES once it
+# grows this many messages beyond it. Truncating in batches rather than on
+# every turn keeps the history prefix stable between truncations.
+HISTORY_TRUNCATION_THRESHOLD = 10
+
+# Tracking IDs, as recognized by both response caches: six or more letters and
+# digits, at least one of which is a digit
+_TRACKING_ID_PATTERN = r"(?=[A-Z0-9]*\d)[A-Z0-9]{6,}"
+
+# Answers to plain "track <tracking id>" requests are cached for a few minutes
+# and shared by all agents, so repeated lookups skip the LLM round trip. The
+# key includes the current hour, so answers are never reused across hours.
+# Only answers given on the first turn of a conversation are stored, since
+# later ones can depend on what was said before.
+_TRACKING_QUERY_RE = re.compile(
+    rf"(?:please\s+)?track\s+(?:(?:my\s+)?(?:package|shipment|parcel)\s+)?({_TRACKING_ID_PATTERN})\s*[.!?]?",
+    re.IGNORECASE
+)
+_response_cache = TTLCache(maxsize=10_000, ttl=300)
+
+
+def _response_cache_key(user_message: str) -> Optional[tuple[str, str]]:
+    """
+    Get the response cache key for a plain tracking request.
+    
+    Args:
+        user_message: The user's input message
+        
+    Returns:
+        A (tracking ID, current hour) key, or None if the message is not a plain tracking request
+    """
+    match = _TRACKING_QUERY_RE.fullmatch(user_message.strip())
+    if match is None:
+        return None
+    return match.group(1).upper(), datetime.now().strftime("%Y-%m-%dT%H")
+
+# Other questions about specific packages ("Where is PKG123456789 right now?")
+# are answered from a semantic cache: a stored answer is reused when its query
+# embedding is similar enough and it mentions exactly the same tracking IDs,
+# so paraphrases match but questions about different packages never do.
+# The cache is shared by all sessions, so it is only used for the first turn
+# of a conversation (and for chat_many()), whose answer can't depend on
+# earlier turns.
+# Since the scope already pins the packages, the similarity threshold only has
+# to tell rewordings apart from different questions; its best value depends on
+# the embedding model, so it is configurable (Config.SEMANTIC_CACHE_THRESHOLD).
+# The embedding request counts towards the turn's time budget and is given
+# at most SEMANTIC_CACHE_EMBEDDING_TIMEOUT seconds; if it takes longer or
+# fails, the turn goes on without the cache.
+SEMANTIC_CACHE_SIZE = 100
+SEMANTIC_CACHE_TTL = 60.0
+SEMANTIC_CACHE_EMBEDDING_TIMEOUT = 1.0
+_TRACKING_ID_RE = re.compile(rf"\b{_TRACKING_ID_PATTERN}\b", re.IGNORECASE)
+_semantic_cache = SemanticCache(
+    maxsize=SEMANTIC_CACHE_SIZE,
+    ttl=SEMANTIC_CACHE_TTL,
+    threshold=Config.SEMANTIC_CACHE_THRESHOLD
+)
+
+
+def _semantic_cache_scope(user_message: str) -> Optional[tuple[str, ...]]:
+    """
+    Get the semantic cache scope of a message, which is the set of tracking IDs it mentions.
+    
+    Args:
+        user_message: The user's input message
+        
+    Returns:
+        The sorted upper-case tracking IDs, or None if the message mentions none
+    """
+    tracking_ids = {tracking_id.upper() for tracking_id in _TRACKING_ID_RE.findall(user_message)}
+    return tuple(sorted(tracking_ids)) or None
+
+
+def _has_failed_tool_result(message: "ChatMessageContent") -> bool:
+    """
+    Check whether a message carries a function result that reports an error.
+    
+    Answers built on failed lookups (network errors, timeouts, ...) must not be
+    cached, for the same reason the plugin doesn't cache error results: the
+    failure may be transient and the next attempt should retry it.
+    
+    Args:
+        message: A message added to the thread during the turn
+        
+    Returns:
+        True if any function result in the message is an error result
+    """
+    from semantic_kernel.contents import FunctionResultContent
+    
+    for item in message.items:
+        if isinstance(item, FunctionResultContent):
+            # track_packages returns one result per tracking ID
+            results = item.result if isinstance(item.result, list) else [item.result]
+            if any(isinstance(result, dict) and "error" in result for result in results):
+                return True
+    return False
+
+# Prompt layout and caching:
+# Every request is sent as [system instructions, tool schema, thread history,
+# new user message]. The provider can only reuse its cached prompt prefix up
+# to the first token that changes, so static content has to stay at the
+# beginning and dynamic content at the end:
+#   - AGENT_INSTRUCTIONS must stay byte-identical across turns and sessions;
+#     never interpolate dates, user names or other per-session values into it.
+#   - The current date is fetched through the get_current_date_and_time tool,
+#     so it only ever appears as a tool result appended to the thread.
+#   - Earlier thread messages are never mutated; chat() only appends the new
+#     user message as the last item, without any preamble.
+AGENT_INSTRUCTIONS = """
+You are a helpful shipment tracking assistant. You can help users track their packages
+and provide detailed information about shipment status, locations, and delivery updates.
+
+Make sure to use the current date and time (get_current_date_and_time).
+If the user didn't provide any time information, use the most recent date within the last four weeks.
+
+When users ask about tracking packages, use the track_package function to get the most
+up-to-date information. If they ask about several packages, use track_packages to look
+them all up at once. Always provide clear, friendly responses and explain the status
+in an easy-to-understand way.
+Don't say, that there is no update unless you have checked all possible sources.
+
+If a package cannot be found, suggest that the user double-check the tracking number
+and contact customer service if the issue persists.
+""".strip()
+
+
+@functools.cache
+def _get_function_choice_behavior() -> "FunctionChoiceBehavior":
+    """
+    Get the function choice behavior shared by all agents.
+    
+    The agent only reads it when preparing the execution settings of a
+    request, so one instance is enough.
+    
+    Returns:
+        The shared automatic function choice behavior
+    """
+    from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
+    
+    return FunctionChoiceBehavior.Auto()
+
+# Process-wide Azure OpenAI client shared by all agent instances, so that
+# concurrent sessions reuse pooled keep-alive connections instead of paying
+# a TCP/TLS handshake per agent.
+_shared_async_client: Optional["AsyncAzureOpenAI"] = None
+
+
+def _get_shared_async_client() -> "AsyncAzureOpenAI":
+    """
+    Get the shared Azure OpenAI client, creating it on first use.
+    
+    Returns:
+        The process-wide AsyncAzureOpenAI client
+    """
+    global _shared_async_client
+    if _shared_async_client is None:
+        import httpx
+        from openai import AsyncAzureOpenAI
+        
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=httpx.Timeout(Config.LLM_TIMEOUT_SECONDS, connect=5.0)
+        )
+        _shared_async_client = AsyncAzureOpenAI(
+            azure_endpoint=Config.AZURE_OPENAI_ENDPOINT,
+            api_key=Config.AZURE_OPENAI_API_KEY,
+            api_version=Config.AZURE_OPENAI_API_VERSION,
+            http_client=http_client
+        )
+    return _shared_async_client
+
+
+async def close_shared_clients():
+    """
+    Close the shared HTTP clients. Call this once when the application shuts down.
+    
+    The shared kernel and services are bound to the closed clients, so they are
+    dropped as well; agents created afterwards build fresh ones.
+    """
+    global _shared_async_client, _shared_kernel, _shared_tracking_plugin
+    global _shared_http_session, _shared_embedding_service, _warmup_task
+    with _shared_kernel_lock:
+        warmup_task, _warmup_task = _warmup_task, None
+        tracking_plugin, _shared_tracking_plugin = _shared_tracking_plugin, None
+        http_session, _shared_http_session = _shared_http_session, None
+        async_client, _shared_async_client = _shared_async_client, None
+        _shared_kernel = None
+        _shared_embedding_service = None
+    
+    if warmup_task is not None:
+        # Let the cancelled warm-up finish before its client is closed
+        warmup_task.cancel()
+        await asyncio.gather(warmup_task, return_exceptions=True)
+    if tracking_plugin is not None:
+        await tracking_plugin.close()
+    if http_session is not None:
+        await http_session.close()
+    if async_client is not None:
+        await async_client.close()
+
+
+# Kernel (AI service, function filter and plugin) shared by all agent instances
+_shared_kernel: Optional["Kernel"] = None
+_shared_tracking_plugin: Optional["ShipmentTrackingPlugin"] = None
+_shared_http_session: Optional["aiohttp.ClientSession"] = None
+_shared_embedding_service: Optional["AzureTextEmbedding"] = None
+_shared_kernel_lock = threading.Lock()
+
+
+def _is_event_loop_running() -> bool:
+    """Check whether this thread is running an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _build_shared_kernel() -> "Kernel":
+    """
+    Build the kernel with the Azure OpenAI service, the function filter and the tracking plugin.
+    
+    Also creates the embedding service for the semantic response cache, if configured.
+    
+    Returns:
+        The configured kernel
+    """
+    global _shared_tracking_plugin, _shared_http_session, _shared_embedding_service
+    from semantic_kernel import Kernel
+    from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion, AzureTextEmbedding
+    from semantic_kernel.filters.filter_types import FilterTypes
+    
+    from plugins import ShipmentTrackingPlugin
+    
+    kernel = Kernel()
+    
+    # Add Azure OpenAI chat completion service backed by the shared client
+    chat_completion = AzureChatCompletion(
+        deployment_name=Config.AZURE_OPENAI_CHAT_DEPLOYMENT_NAME,
+        endpoint=Config.AZURE_OPENAI_ENDPOINT,
+        api_key=Config.AZURE_OPENAI_API_KEY,
+        api_version=Config.AZURE_OPENAI_API_VERSION,
+        async_client=_get_shared_async_client()
+    )
+    kernel.add_service(chat_completion)
+    
+    # Create the embedding service for the semantic response cache, if configured.
+    # It is kept outside the kernel, which only provides the chat service to agents.
+    # A cache lookup is only worth a single attempt, so it goes through a copy
+    # of the shared client (same connection pool) without retries.
+    if Config.USE_SEMANTIC_CACHE and Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME:
+        _shared_embedding_service = AzureTextEmbedding(
+            deployment_name=Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME,
+            endpoint=Config.AZURE_OPENAI_ENDPOINT,
+            api_key=Config.AZURE_OPENAI_API_KEY,
+            api_version=Config.AZURE_OPENAI_API_VERSION,
+            async_client=_get_shared_async_client().with_options(max_retries=0)
+        )
+        logger.info("🧠 Created embedding service for the semantic response cache")
+    
+    # Add verbose function filter for detailed logging. It is always registered
+    # and only logs for calls made from a verbose agent, so verbose and
+    # non-verbose agents can share the kernel.
+    verbose_filter = VerboseFunctionFilter()
+    kernel.add_filter(FilterTypes.FUNCTION_INVOCATION, verbose_filter.on_function_invocation)
+    logger.info("🔍 Added verbose function invocation filter")
+    
+    # Give the plugin a session owned by this module, so it is created once per
+    # kernel and closed together with the other shared clients. aiohttp needs a
+    # running event loop for that; without one the plugin creates its own
+    # session on first use.
+    if not Config.USE_SIMULATED_API and _is_event_loop_running():
+        _shared_http_session = ShipmentTrackingPlugin.create_session()
+    
+    # Add the shipment tracking plugin
+    tracking_plugin = ShipmentTrackingPlugin(
+        base_url=Config.SHIPMENT_API_BASE_URL,
+        api_key=Config.SHIPMENT_API_KEY,
+        use_simulation=Config.USE_SIMULATED_API,
+        session=_shared_http_session
+    )
+    kernel.add_plugin(
+        plugin=tracking_plugin,
+        plugin_name="ShipmentTracking"
+    )
+    _shared_tracking_plugin = tracking_plugin
+    logger.info("📦 Added ShipmentTracking plugin")
+    
+    return kernel
+
+
+async def _embed_queries(user_messages: list[str], timeout: float) -> Optional["np.ndarray"]:
+    """
+    Embed messages for the semantic response cache in a single request.
+    
+    A failed or slow request only skips the cache for this call, since the
+    failure may be transient; the next call tries again.
+    
+    Args:
+        user_messages: The user's input messages
+        timeout: Maximum time in seconds to wait for the embeddings
+        
+    Returns:
+        One embedding row per message, or None if the semantic cache is not available
+    """
+    if _shared_embedding_service is None:
+        return None
+    try:
+        async with asyncio.timeout(timeout):
+            return await _shared_embedding_service.generate_embeddings(user_messages)
+    except TimeoutError:
+        logger.warning("⚠️ Semantic response cache skipped, embedding request took longer than %g seconds", timeout)
+    except Exception as e:
+        logger.warning("⚠️ Semantic response cache skipped, embedding request failed: %s", e)
+    return None
+
+
+# Background request that opens the connection to Azure OpenAI ahead of the
+# first chat turn; started at most once per process
+_warmup_task: Optional[asyncio.Task] = None
+
+
+async def _warm_up_connection():
+    """
+    Send a lightweight request so the TCP/TLS connection is ready before the first chat turn.
+    
+    Listing the models is not billed and works for every deployment type, unlike
+    a completion request.
+    """
+    try:
+        await _get_shared_async_client().with_options(max_retries=0).models.list()
+        logger.info("🔥 Azure OpenAI connection warmed up")
+    except Exception as e:
+        # The connection is usually established even if the request itself is rejected
+        logger.info("🔥 Azure OpenAI warm-up request failed: %s", e)
+
+
+def start_connection_warmup():
+    """
+    Open the Azure OpenAI connection in the background, once per process.
+    
+    Only worth calling where there is idle time to overlap with, such as an
+    interactive session waiting for the user's first message. Must be called
+    from a running event loop.
+    """
+    global _warmup_task
+    if _warmup_task is None:
+        _warmup_task = asyncio.get_running_loop().create_task(_warm_up_connection())
+
+
+def _get_shared_kernel() -> "Kernel":
+    """
+    Get the shared kernel, building it on first use.
+    
+    Returns:
+        The process-wide kernel
+    """
+    global _shared_kernel
+    with _shared_kernel_lock:
+        if _shared_kernel is None:
+            _shared_kernel = _build_shared_kernel()
+        return _shared_kernel
+
 
 class ShipmentTrackingAgent:
     """
     A conversational agent that can answer shipment tracking questions using ChatCompletionAgent framework.
     """
     
+    __slots__ = ("verbose_mode", "agent", "thread")
+    
     def __init__(self, verbose_mode: bool = False):
         """
         Initialize the shipment tracking agent.
@@ -30,12 +420,13 @@ class ShipmentTrackingAgent:
             verbose_mode: Whether to enable verbose logging and function filtering
         """
         self.verbose_mode = verbose_mode
-        self.agent: Optional[ChatCompletionAgent] = None
-        self.thread: Optional[ChatHistoryAgentThread] = None
+        self.agent: Optional["ChatCompletionAgent"] = None
+        self.thread: Optional["ChatHistoryAgentThread"] = None
         self.setup_agent()
     
     def setup_agent(self):
         """Initialize the agent using the ChatCompletionAgent framework."""
+        from semantic_kernel.agents import ChatCompletionAgent
         
         if self.verbose_mode:
             logger.info("🏗️  Setting up Semantic Kernel ChatCompletionAgent...")
@@ -45,56 +436,18 @@ class ShipmentTrackingAgent:
             missing = Config.get_missing_config()
             raise ValueError(f"Missing required configuration: {', '.join(missing)}")
         
-        # Create kernel and add services
-        kernel = Kernel()
-        
-        # Add Azure OpenAI chat completion service
-        chat_completion = AzureChatCompletion(
-            deployment_name=Config.AZURE_OPENAI_CHAT_DEPLOYMENT_NAME,
-            endpoint=Config.AZURE_OPENAI_ENDPOINT,
-            api_key=Config.AZURE_OPENAI_API_KEY,
-            api_version=Config.AZURE_OPENAI_API_VERSION
-        )
-        kernel.add_service(chat_completion)
-        
-        # Add verbose function filter for detailed logging (only in verbose mode)
-        if self.verbose_mode:
-            verbose_filter = VerboseFunctionFilter()
-            kernel.add_filter(FilterTypes.FUNCTION_INVOCATION, verbose_filter.on_function_invocation)
-            logger.info("🔍 Added verbose function invocation filter")
-        
-        # Add the shipment tracking plugin
-        tracking_plugin = ShipmentTrackingPlugin(
-            base_url=Config.SHIPMENT_API_BASE_URL,
-            api_key=Config.SHIPMENT_API_KEY,
-            use_simulation=Config.USE_SIMULATED_API
-        )
-        kernel.add_plugin(
-            plugin=tracking_plugin,
-            plugin_name="ShipmentTracking"
-        )
+        # The kernel, AI service and plugin are shared by all agent instances;
+        # only the conversation thread is kept per session
+        kernel = _get_shared_kernel()
         if self.verbose_mode:
-            logger.info("📦 Added ShipmentTracking plugin")
+            logger.info("📦 Using shared kernel with ShipmentTracking plugin")
         
         # Create the agent using the ChatCompletionAgent framework
         self.agent = ChatCompletionAgent(
             kernel=kernel,
             name="ShipmentTrackingAgent",
-            instructions="""
-            You are a helpful shipment tracking assistant. You can help users track their packages 
-            and provide detailed information about shipment status, locations, and delivery updates.
-
-            Make sure to use the current date and time (get_current_date_and_time).
-            If the user didn't provide any time information, use the most recent date within the last four weeks.
-
-            When users ask about tracking packages, use the track_package function to get the most 
-            up-to-date information. Always provide clear, friendly responses and explain the status 
-            in an easy-to-understand way.
-            Don't say, that there is no update unless you have checked all possible sources.
-
-            If a package cannot be found, suggest that the user double-check the tracking number 
-            and contact customer service if the issue persists.
-            """
+            instructions=AGENT_INSTRUCTIONS,
+            function_choice_behavior=_get_function_choice_behavior()
         )
         
         if self.verbose_mode:
@@ -104,49 +457,284 @@ class ShipmentTrackingAgent:
         """
         Process a user message with streaming response for better user experience.
         
+        The response is written to stdout as it streams in, batched rather than
+        with one write per token.
+        
         Args:
             user_message: The user's input message
             
         Returns:
-            The complete agent's response as a string
+            The complete agent's response as a string, as shown to the user
+        """
+        # Show the prefix right away, as the only sign of progress while the
+        # first chunk (possibly after tool calls) is on its way
+        sys.stdout.write("Agent: ")
+        sys.stdout.flush()
+        
+        # The chunks are accumulated once; each flush writes the ones added
+        # since the previous flush
+        parts = []
+        flushed = 0
+        pending_len = 0
+        last_flush = time.monotonic()
+        
+        async with contextlib.aclosing(self.chat_stream(user_message)) as chunks:
+            async for chunk in chunks:
+                parts.append(chunk)
+                pending_len += len(chunk)
+                
+                # Flush in batches instead of issuing a write per token
+                now = time.monotonic()
+                if pending_len >= STREAM_FLUSH_CHARS or now - last_flush >= STREAM_FLUSH_INTERVAL:
+                    sys.stdout.write("".join(parts[flushed:]))
+                    sys.stdout.flush()
+                    flushed = len(parts)
+                    pending_len = 0
+                    last_flush = now
+        
+        # Write the remaining chunks and a new line after streaming
+        sys.stdout.write("".join(parts[flushed:]) + "\n")
+        sys.stdout.flush()
+        return "".join(parts)
+    
+    async def chat_stream(self, user_message: str) -> AsyncIterator[str]:
+        """
+        Process a user message and yield the agent's response as it is generated.
+        
+        Close the generator (for example with contextlib.aclosing) when stopping
+        early, so the pending request is cancelled right away rather than when
+        the generator is garbage-collected.
+        
+        Args:
+            user_message: The user's input message
+            
+        Yields:
+            Chunks of the agent's response; if the request fails, the error
+            message is yielded as the last chunk
         """
         
         if self.verbose_mode:
-            logger.info(f"👤 User message: {user_message}")
+            logger.info("👤 User message: %s", user_message)
+        
+        if self.thread is None:
+            self.thread = self._create_thread()
+        
+        # Answers given on the first turn don't depend on earlier turns, so only
+        # those are shared with other conversations through the caches
+        fresh_thread = len(self.thread) == 0
+        
+        # Serve plain tracking requests from the response cache (not in verbose
+        # mode, where the function calls are what the user wants to see)
+        cache_key = None if self.verbose_mode else _response_cache_key(user_message)
+        if cache_key is not None:
+            cached_response = _response_cache.get(cache_key)
+            if cached_response is not None:
+                await self._record_cached_reply(user_message, cached_response)
+                yield cached_response
+                return
+        
+        # The time budget of the turn starts here and also covers the embedding request
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + Config.LLM_TIMEOUT_SECONDS
+        
+        # Otherwise look for an answer to a paraphrase of the same question, as
+        # long as this is the first turn of the conversation
+        semantic_scope = (
+            _semantic_cache_scope(user_message) if fresh_thread and not self.verbose_mode else None
+        )
+        query_embedding = None
+        if semantic_scope is not None:
+            embeddings = await _embed_queries(
+                [user_message],
+                timeout=min(SEMANTIC_CACHE_EMBEDDING_TIMEOUT, deadline - loop.time())
+            )
+            query_embedding = None if embeddings is None else embeddings[0]
+            if query_embedding is not None:
+                cached_response = _semantic_cache.get(semantic_scope, query_embedding)
+                if cached_response is not None:
+                    await self._record_cached_reply(user_message, cached_response)
+                    yield cached_response
+                    return
+        
+        response_buffer = io.StringIO()
+        tool_failed = False
+        
+        async def check_tool_results(message: "ChatMessageContent"):
+            nonlocal tool_failed
+            tool_failed = tool_failed or _has_failed_tool_result(message)
+        
+        # Use streaming invoke; the user message is appended to the end of
+        # the thread as-is so the cached prompt prefix stays intact
+        stream = self.agent.invoke_stream(
+            messages=user_message,
+            thread=self.thread,
+            on_intermediate_message=check_tool_results
+        )
+        
+        async def next_response():
+            # The timeout and the shared function filter's verbose flag only
+            # cover waiting for the next chunk, so neither spans a yield back
+            # into the caller's code (whose context may differ on resumption)
+            verbose_token = verbose_function_logging.set(self.verbose_mode)
+            try:
+                async with asyncio.timeout_at(deadline):
+                    return await anext(stream, None)
+            finally:
+                verbose_function_logging.reset(verbose_token)
         
         try:
-            response_parts = []
-            print("Agent: ", end="", flush=True)
-            
-            # Use streaming invoke
-            async for response in self.agent.invoke_stream(
-                messages=user_message,
-                thread=self.thread
-            ):
-                if hasattr(response, 'content') and response.content:
-                    # Convert content to string if it's not already
-                    content_str = str(response.content)
-                    print(content_str, end="", flush=True)
-                    response_parts.append(content_str)
-                    
-                # Update thread from the last response
-                if hasattr(response, 'thread') and response.thread:
-                    self.thread = response.thread
+            while True:
+                response = await next_response()
+                if response is None:
+                    break
+                
+                # The streamed message's text is already a str; going through
+                # response.content would stringify the whole message object
+                content_str = response.message.content
+                if content_str:
+                    response_buffer.write(content_str)
+                    yield content_str
             
-            print()  # New line after streaming
+            # Drop the oldest messages once the history exceeds its budget, so
+            # the prompt does not keep growing with every turn
+            await self.thread.reduce()
             
-            complete_response = "".join(response_parts)
+            complete_response = response_buffer.getvalue()
+            cacheable = bool(complete_response) and not tool_failed
+            if cache_key is not None and cacheable and fresh_thread:
+                _response_cache.set(cache_key, complete_response)
+            if query_embedding is not None and cacheable:
+                _semantic_cache.set(semantic_scope, query_embedding, complete_response)
             if self.verbose_mode:
-                logger.info(f"💬 Complete streaming response: {complete_response}")
-            
-            return complete_response
+                logger.info("💬 Complete streaming response: %s", complete_response)
+        
+        except TimeoutError:
+            error_message = (
+                f"I'm sorry, the request took longer than {Config.LLM_TIMEOUT_SECONDS:g} seconds. "
+                "Please try again."
+            )
+            if self.verbose_mode:
+                logger.error("⏱️ Chat timed out after %g seconds", Config.LLM_TIMEOUT_SECONDS)
+            yield ("\n" if response_buffer.tell() else "") + error_message
                 
         except Exception as e:
             error_message = f"I'm sorry, I encountered an error while processing your request: {str(e)}"
             if self.verbose_mode:
-                logger.error(f"❌ Chat error: {str(e)}")
-            print(f"\n{error_message}")
-            return error_message
+                logger.error("❌ Chat error: %s", e)
+            yield ("\n" if response_buffer.tell() else "") + error_message
+        finally:
+            await stream.aclose()
+    
+    async def _record_cached_reply(self, user_message: str, cached_response: str):
+        """
+        Record an exchange answered from a cache in the conversation thread.
+        
+        Args:
+            user_message: The user's input message
+            cached_response: The cached agent response
+        """
+        from semantic_kernel.contents import AuthorRole, ChatMessageContent
+        
+        await self.thread.on_new_message(ChatMessageContent(role=AuthorRole.USER, content=user_message))
+        await self.thread.on_new_message(
+            ChatMessageContent(role=AuthorRole.ASSISTANT, content=cached_response, name=self.agent.name)
+        )
+        await self.thread.reduce()
+    
+    def _create_thread(self) -> "ChatHistoryAgentThread":
+        """
+        Create a conversation thread with a bounded history.
+        
+        Returns:
+            A new thread whose history is truncated to Config.MAX_HISTORY_MESSAGES
+        """
+        from semantic_kernel.agents import ChatHistoryAgentThread
+        from semantic_kernel.contents import ChatHistoryTruncationReducer
+        
+        # The truncation never separates a function call from its result
+        chat_history = ChatHistoryTruncationReducer(
+            target_count=Config.MAX_HISTORY_MESSAGES,
+            threshold_count=HISTORY_TRUNCATION_THRESHOLD
+        )
+        return ChatHistoryAgentThread(chat_history=chat_history)
+    
+    async def chat_many(self, user_messages: list[str]) -> list[str]:
+        """
+        Process several independent single-turn messages concurrently.
+        
+        Each message is answered in its own fresh thread without printing, so the
+        messages neither see each other nor the current conversation. At most
+        Config.MAX_CONCURRENT_CHATS requests are in flight at the same time.
+        Messages about specific packages are looked up in the semantic response
+        cache first, with all of their embeddings fetched in one request.
+        
+        Args:
+            user_messages: The user's input messages
+            
+        Returns:
+            The agent's responses, in the same order as the messages
+        """
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_CHATS)
+        
+        # Embed every message that can use the semantic cache in one batch
+        # rather than with a request per message
+        semantic_scopes = [
+            None if self.verbose_mode else _semantic_cache_scope(message) for message in user_messages
+        ]
+        embedded_indexes = [index for index, scope in enumerate(semantic_scopes) if scope is not None]
+        query_embeddings = {}
+        if embedded_indexes:
+            embeddings = await _embed_queries(
+                [user_messages[index] for index in embedded_indexes],
+                timeout=SEMANTIC_CACHE_EMBEDDING_TIMEOUT
+            )
+            if embeddings is not None:
+                query_embeddings = dict(zip(embedded_indexes, embeddings))
+        
+        async def respond(index: int, user_message: str) -> str:
+            semantic_scope = semantic_scopes[index]
+            query_embedding = query_embeddings.get(index)
+            async with semaphore:
+                # Checked once the slot is free, so earlier answers can be reused
+                if query_embedding is not None:
+                    cached_response = _semantic_cache.get(semantic_scope, query_embedding)
+                    if cached_response is not None:
+                        return cached_response
+                try:
+                    async with asyncio.timeout(Config.LLM_TIMEOUT_SECONDS):
+                        response = await self.agent.get_response(messages=user_message)
+                    response_text = str(response.content)
+                    if query_embedding is not None and response_text:
+                        # The answer's thread holds only this exchange, tool results included
+                        tool_failed = False
+                        async for message in response.thread.get_messages():
+                            tool_failed = tool_failed or _has_failed_tool_result(message)
+                        if not tool_failed:
+                            _semantic_cache.set(semantic_scope, query_embedding, response_text)
+                    return response_text
+                except TimeoutError:
+                    if self.verbose_mode:
+                        logger.error("⏱️ Chat timed out after %g seconds", Config.LLM_TIMEOUT_SECONDS)
+                    return (
+                        f"I'm sorry, the request took longer than {Config.LLM_TIMEOUT_SECONDS:g} seconds. "
+                        "Please try again."
+                    )
+                except Exception as e:
+                    if self.verbose_mode:
+                        logger.error("❌ Chat error: %s", e)
+                    return f"I'm sorry, I encountered an error while processing your request: {str(e)}"
+        
+        if self.verbose_mode:
+            logger.info("👥 Processing %d messages concurrently", len(user_messages))
+        
+        # Tasks created by gather copy the current context, including this flag
+        verbose_token = verbose_function_logging.set(self.verbose_mode)
+        try:
+            return list(await asyncio.gather(
+                *(respond(index, message) for index, message in enumerate(user_messages))
+            ))
+        finally:
+            verbose_function_logging.reset(verbose_token)
     
     def reset_conversation(self):
         """Reset the conversation thread."""
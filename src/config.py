@@ -2,6 +2,7 @@
 Configuration management for the shipment tracking application.
 """
 
+import functools
 import os
 from dotenv import load_dotenv
 
@@ -27,11 +28,21 @@ class Config:
     SHIPMENT_API_KEY = os.getenv("SHIPMENT_API_KEY")  # Optional API key for authentication
     USE_SIMULATED_API = os.getenv("USE_SIMULATED_API", "true").lower() == "true"
     
+    # Agent configuration
+    MAX_CONCURRENT_CHATS = int(os.getenv("MAX_CONCURRENT_CHATS", "8"))  # Upper bound for chat_many()
+    MAX_HISTORY_MESSAGES = int(os.getenv("MAX_HISTORY_MESSAGES", "20"))  # Messages kept in the conversation thread
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))  # Upper bound for a single chat turn
+    USE_SEMANTIC_CACHE = os.getenv("USE_SEMANTIC_CACHE", "false").lower() == "true"  # Needs the embedding deployment
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.87"))  # Minimum cosine similarity for a match
+    
     @classmethod
+    @functools.cache
     def validate_required_config(cls) -> bool:
         """
         Validate that all required configuration is present.
         
+        The values are read once at import time, so the result is cached.
+        
         Returns:
             True if all required config is present, False otherwise
         """
@@ -52,6 +63,12 @@ class Config:
         Returns:
             List of missing environment variable names
         """
+        return list(cls._missing_config())
+    
+    @classmethod
+    @functools.cache
+    def _missing_config(cls) -> tuple[str, ...]:
+        """Compute the missing configuration variable names once and cache them."""
         missing = []
         
         if not cls.AZURE_OPENAI_ENDPOINT:
@@ -63,4 +80,4 @@ class Config:
         if not cls.AZURE_OPENAI_CHAT_DEPLOYMENT_NAME:
             missing.append("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
             
-        return missing
+        return tuple(missing)
@@ -10,7 +10,7 @@ import os
 # Add the current directory to the Python path so we can import from agent.py
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from agent import ShipmentTrackingAgent
+from agent import ShipmentTrackingAgent, close_shared_clients
 
 
 async def demo():
@@ -31,17 +31,17 @@ async def demo():
         "What information do you have about tracking ID PKG999999999?"
     ]
     
-    for i, query in enumerate(test_queries, 1):
+    # The test cases are independent, so run them concurrently (bounded by
+    # MAX_CONCURRENT_CHATS) and print the answers in order once all are in
+    try:
+        responses = await agent.chat_many(test_queries)
+    finally:
+        await close_shared_clients()
+    
+    for i, (query, response) in enumerate(zip(test_queries, responses), 1):
         print(f"\n📦 Test Case {i}")
         print(f"User: {query}")
-        print("Agent: ", end="")
-        
-        try:
-            response = await agent.chat(query)
-            print(response)
-        except Exception as e:
-            print(f"Error: {str(e)}")
-        
+        print(f"Agent: {response}")
         print("-" * 60)
     
     print("\n✅ Demo completed!")
@@ -2,6 +2,6 @@
 Filters package for Semantic Kernel function invocation handling.
 """
 
-from .verbose_function_filter import VerboseFunctionFilter
+from .verbose_function_filter import VerboseFunctionFilter, verbose_function_logging
 
-__all__ = ['VerboseFunctionFilter']
+__all__ = ['VerboseFunctionFilter', 'verbose_function_logging']
@@ -3,16 +3,27 @@ Custom filters for Semantic Kernel function invocation logging.
 """
 
 import logging
+from contextvars import ContextVar
 from datetime import datetime
-from semantic_kernel.filters.functions.function_invocation_context import FunctionInvocationContext
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from semantic_kernel.filters.functions.function_invocation_context import FunctionInvocationContext
 
 logger = logging.getLogger(__name__)
 
+# Whether function invocations in the current context should be logged. The
+# filter is registered on a kernel shared by all agents, so verbose mode is
+# switched per call rather than per kernel.
+verbose_function_logging: ContextVar[bool] = ContextVar("verbose_function_logging", default=False)
+
+_BANNER = "=" * 60
+
 
 class VerboseFunctionFilter:
     """Custom filter to log detailed function call information."""
     
-    async def on_function_invocation(self, context: FunctionInvocationContext, next):
+    async def on_function_invocation(self, context: "FunctionInvocationContext", next):
         """
         Log function invocation details before and after execution.
         
@@ -21,34 +32,42 @@ class VerboseFunctionFilter:
             next: The next filter or function in the chain
         """
         
+        if not verbose_function_logging.get():
+            await next(context)
+            return
+        
         function_name = context.function.name
         plugin_name = context.function.plugin_name
         arguments = context.arguments
         
-        logger.info("=" * 60)
-        logger.info(f"🚀 FUNCTION INVOCATION STARTED")
-        logger.info(f"📍 Plugin: {plugin_name}")
-        logger.info(f"🔧 Function: {function_name}")
-        logger.info(f"📝 Arguments: {dict(arguments) if arguments else 'None'}")
-        logger.info(f"⏰ Timestamp: {datetime.now().isoformat()}")
-        logger.info("=" * 60)
+        # Skip formatting entirely if the log level would drop the records anyway
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(_BANNER)
+            logger.info("🚀 FUNCTION INVOCATION STARTED")
+            logger.info("📍 Plugin: %s", plugin_name)
+            logger.info("🔧 Function: %s", function_name)
+            logger.info("📝 Arguments: %r", arguments or None)
+            logger.info("⏰ Timestamp: %s", datetime.now().isoformat())
+            logger.info(_BANNER)
         
         try:
             # Execute the function
             await next(context)
             
-            logger.info("=" * 60)
-            logger.info(f"✅ FUNCTION INVOCATION COMPLETED")
-            logger.info(f"🔧 Function: {plugin_name}.{function_name}")
-            logger.info(f"📤 Result: {context.result}")
-            logger.info(f"⏰ Completed at: {datetime.now().isoformat()}")
-            logger.info("=" * 60)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(_BANNER)
+                logger.info("✅ FUNCTION INVOCATION COMPLETED")
+                logger.info("🔧 Function: %s.%s", plugin_name, function_name)
+                logger.info("📤 Result: %s", context.result)
+                logger.info("⏰ Completed at: %s", datetime.now().isoformat())
+                logger.info(_BANNER)
             
         except Exception as e:
-            logger.error("=" * 60)
-            logger.error(f"❌ FUNCTION INVOCATION FAILED")
-            logger.error(f"🔧 Function: {plugin_name}.{function_name}")
-            logger.error(f"💥 Error: {str(e)}")
-            logger.error(f"⏰ Failed at: {datetime.now().isoformat()}")
-            logger.error("=" * 60)
+            if logger.isEnabledFor(logging.ERROR):
+                logger.error(_BANNER)
+                logger.error("❌ FUNCTION INVOCATION FAILED")
+                logger.error("🔧 Function: %s.%s", plugin_name, function_name)
+                logger.error("💥 Error: %s", e)
+                logger.error("⏰ Failed at: %s", datetime.now().isoformat())
+                logger.error(_BANNER)
             raise
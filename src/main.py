@@ -2,31 +2,57 @@
 Command-line interface utilities for the shipment tracking application.
 """
 
-import sys
 import asyncio
+import contextlib
+import threading
 
-from agent import ShipmentTrackingAgent
-from utils import Spinner, setup_logging, check_verbose_mode
+from agent import ShipmentTrackingAgent, close_shared_clients, start_connection_warmup
+from utils import setup_logging, parse_args
 
+# uvloop is an optional speed-up (not available on Windows); fall back to the
+# default asyncio event loop when it isn't installed
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
-def print_help():
-    """Print help information for the application."""
-    print("🚚 Shipment Tracking Agent Demo")
-    print("Usage: python main.py [options]")
-    print("")
-    print("Options:")
-    print("  --verbose, -v    Enable verbose logging with detailed function call information")
-    print("  --help, -h       Show this help message")
-    print("")
-    print("In verbose mode, you'll see:")
-    print("  📦 Function calls with parameters")
-    print("  🔧 LLM requests and responses")
-    print("  📝 Detailed execution logs")
-    print("  💾 Logs saved to 'semantic_kernel_debug.log'")
-    print("")
-    print("Features:")
-    print("  💬 Real-time streaming responses for better user experience")
-    print("  🚀 Optimized for interactive conversations")
+# Commands that end the interactive session
+_EXIT_COMMANDS = frozenset({"quit", "exit", "bye", "q"})
+
+
+async def ainput(prompt: str = "") -> str:
+    """
+    Read a line from stdin without blocking the event loop.
+    
+    input() runs on a daemon thread rather than in the default executor, so a
+    pending read never keeps the interpreter from exiting on Ctrl+C.
+    
+    Args:
+        prompt: The prompt to print before reading
+        
+    Returns:
+        The line read from stdin, without the trailing newline
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def deliver(setter, value):
+        if not future.done():
+            setter(value)
+    
+    def read_line():
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            outcome = (future.set_exception, e)
+        else:
+            outcome = (future.set_result, line)
+        # The loop may already be closed if the session ended while waiting
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(deliver, *outcome)
+    
+    threading.Thread(target=read_line, daemon=True).start()
+    return await future
 
 
 def print_welcome(verbose_mode: bool):
@@ -55,15 +81,13 @@ def print_welcome(verbose_mode: bool):
     print("=" * 50)
 
 
-async def run_interactive_session():
-    """Run the interactive chat session."""
-    # Check for help flag
-    if '--help' in sys.argv or '-h' in sys.argv:
-        print_help()
-        return
+async def run_interactive_session(verbose_mode: bool = False):
+    """
+    Run the interactive chat session.
     
-    # Check for verbose mode
-    verbose_mode = check_verbose_mode()
+    Args:
+        verbose_mode: Whether to enable verbose logging
+    """
     
     # Setup logging
     logger = setup_logging(verbose_mode)
@@ -83,38 +107,50 @@ async def run_interactive_session():
         print("Please check your configuration and try again.")
         return
     
+    # Open the Azure OpenAI connection while the user is still typing
+    start_connection_warmup()
+    
     # Main chat loop
-    while True:
-        try:
-            # Get user input
-            user_input = input("\nYou: ").strip()
-            
-            # Check for exit commands
-            if user_input.lower() in ['quit', 'exit', 'bye', 'q']:
-                print("\nAgent: Thank you for using the Shipment Tracking service. Have a great day! 👋")
-                break
-            
-            if not user_input:
-                continue
-            
-            # Get response from the agent with streaming
+    try:
+        while True:
             try:
-                await agent.chat(user_input)
+                # Get user input
+                user_input = (await ainput("\nYou: ")).strip()
+                
+                # Check for exit commands
+                if user_input.lower() in _EXIT_COMMANDS:
+                    print("\nAgent: Thank you for using the Shipment Tracking service. Have a great day! 👋")
+                    break
+                
+                if not user_input:
+                    continue
+                
+                # Get response from the agent with streaming
+                try:
+                    await agent.chat(user_input)
+                except Exception as e:
+                    print(f"\nError: {str(e)}")
+                    print("Please try again.")
+                    continue
+                
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                # Ctrl+C cancels the session task while it awaits input
+                print("\n\nAgent: Goodbye! 👋")
+                break
             except Exception as e:
                 print(f"\nError: {str(e)}")
                 print("Please try again.")
-                continue
-            
-        except KeyboardInterrupt:
-            print("\n\nAgent: Goodbye! 👋")
-            break
-        except Exception as e:
-            print(f"\nError: {str(e)}")
-            print("Please try again.")
+    finally:
+        await close_shared_clients()
 
 def main():
     """Main entry point that can be called from the root main.py."""
-    asyncio.run(run_interactive_session())
+    # Parse before starting the event loop, so --help and usage errors exit right away
+    args = parse_args()
+    if uvloop is not None:
+        uvloop.run(run_interactive_session(args.verbose))
+    else:
+        asyncio.run(run_interactive_session(args.verbose))
 
 if __name__ == "__main__":
     """Main entry point for the application."""
@@ -2,7 +2,10 @@
 Utilities package for the shipment tracking application.
 """
 
-from .logging_config import setup_logging, check_verbose_mode
+from .logging_config import setup_logging
+from .cli import parse_args
 from .spinner import Spinner
+from .ttl_cache import TTLCache
+from .semantic_cache import SemanticCache
 
-__all__ = ['setup_logging', 'check_verbose_mode', 'Spinner']
+__all__ = ['setup_logging', 'parse_args', 'Spinner', 'TTLCache', 'SemanticCache']
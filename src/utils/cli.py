@@ -0,0 +1,42 @@
+"""
+Command-line argument parsing for the shipment tracking application.
+"""
+
+import argparse
+from typing import Optional, Sequence
+
+_EPILOG = """
+In verbose mode, you'll see:
+  📦 Function calls with parameters
+  🔧 LLM requests and responses
+  📝 Detailed execution logs
+  💾 Logs saved to 'semantic_kernel_debug.log'
+
+Features:
+  💬 Real-time streaming responses for better user experience
+  🚀 Optimized for interactive conversations
+"""
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command-line arguments.
+
+    Args:
+        argv: Arguments to parse; defaults to sys.argv[1:]
+
+    Returns:
+        Namespace with the parsed options (verbose)
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="🚚 Shipment Tracking Agent Demo",
+        epilog=_EPILOG,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Enable verbose logging with detailed function call information"
+    )
+    return parser.parse_args(argv)
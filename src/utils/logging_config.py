@@ -2,8 +2,10 @@
 Logging configuration and utilities for the shipment tracking application.
 """
 
+import atexit
 import logging
-import sys
+import logging.handlers
+import queue
 from datetime import datetime
 
 
@@ -18,14 +20,24 @@ def setup_logging(verbose_mode: bool = False) -> logging.Logger:
         Logger instance for the application
     """
     if verbose_mode:
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.StreamHandler(),
-                logging.FileHandler('semantic_kernel_debug.log')
-            ]
-        )
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handlers = [
+            logging.StreamHandler(),
+            logging.FileHandler('semantic_kernel_debug.log')
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        # Loggers only enqueue records; a background listener thread does the
+        # console and file writes so they don't block the event loop
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.DEBUG)
+        root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
         
         # Set specific loggers for detailed function call tracking
         logging.getLogger('semantic_kernel').setLevel(logging.DEBUG)
@@ -41,8 +53,3 @@ def setup_logging(verbose_mode: bool = False) -> logging.Logger:
     
     # Create a custom logger for our application
     return logging.getLogger(__name__)
-
-
-def check_verbose_mode() -> bool:
-    """Check if verbose mode is enabled via command line arguments."""
-    return '--verbose' in sys.argv or '-v' in sys.argv
@@ -0,0 +1,164 @@
+"""
+In-memory cache that matches queries by embedding similarity.
+
+numpy is imported on first use rather than at module load, so importing the
+package stays cheap when the cache is disabled or never filled.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Hashable, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class SemanticCache:
+    """A bounded cache that returns the value of the most similar stored query, with per-entry expiry."""
+
+    def __init__(self, maxsize: int, ttl: float, threshold: float):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries; the least recently used entry is evicted first
+            ttl: Time in seconds after which an entry expires
+            threshold: Minimum cosine similarity for a stored query to count as a match
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        # Stored embeddings are rows of one contiguous float32 matrix, allocated
+        # by the first set() once the embedding size is known, so matching is a
+        # single matmul
+        self._matrix: Optional[np.ndarray] = None
+        self._expires_at: Optional[np.ndarray] = None
+        self._scopes: list[Optional[Hashable]] = [None] * maxsize
+        self._values: list[Any] = [None] * maxsize
+        self._rows_by_scope: dict[Hashable, list[int]] = {}
+        self._lru: OrderedDict[int, None] = OrderedDict()
+        self._free_rows = list(range(maxsize - 1, -1, -1))
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        """Convert an embedding to a unit-length float32 vector, so a dot product is the cosine similarity."""
+        import numpy as np
+
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, scope: Hashable, embedding, default: Optional[Any] = None) -> Any:
+        """
+        Get the value stored for the most similar query.
+
+        Args:
+            scope: Only entries stored with an equal scope are considered
+            embedding: Embedding of the query
+            default: Value returned when no entry is similar enough
+
+        Returns:
+            The cached value, or the default
+        """
+        if scope not in self._rows_by_scope:
+            return default
+
+        query = self._normalize(embedding)
+        if query.shape[0] != self._matrix.shape[1]:
+            return default
+
+        row = self._match(scope, query)
+        if row is None:
+            return default
+
+        self._lru.move_to_end(row)
+        return self._values[row]
+
+    def set(self, scope: Hashable, embedding, value: Any):
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+
+        If the scope already holds an entry similar enough to match the query,
+        that entry is replaced rather than stored twice.
+
+        Args:
+            scope: Scope the entry can be matched in
+            embedding: Embedding of the query
+            value: The value to store
+        """
+        import numpy as np
+
+        vector = self._normalize(embedding)
+        if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+            self.clear()
+            self._matrix = np.zeros((self.maxsize, vector.shape[0]), dtype=np.float32)
+            self._expires_at = np.zeros(self.maxsize)
+
+        row = self._match(scope, vector)
+        if row is None:
+            if not self._free_rows:
+                self._remove(next(iter(self._lru)))
+            row = self._free_rows.pop()
+            self._scopes[row] = scope
+            self._rows_by_scope.setdefault(scope, []).append(row)
+
+        self._matrix[row] = vector
+        self._expires_at[row] = time.monotonic() + self.ttl
+        self._values[row] = value
+        self._lru[row] = None
+        self._lru.move_to_end(row)
+
+    def _match(self, scope: Hashable, vector: np.ndarray) -> Optional[int]:
+        """
+        Find the live entry in a scope that is most similar to a normalized query.
+
+        Expired entries of the scope are removed along the way.
+
+        Returns:
+            The entry's row, or None if no entry is similar enough
+        """
+        import numpy as np
+
+        rows = self._rows_by_scope.get(scope)
+        if not rows:
+            return None
+
+        candidates = np.array(rows)
+        live = self._expires_at[candidates] > time.monotonic()
+        for row in candidates[~live]:
+            self._remove(int(row))
+        candidates = candidates[live]
+        if not candidates.size:
+            return None
+
+        similarities = self._matrix[candidates] @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return int(candidates[best])
+
+    def _remove(self, row: int):
+        """Free a matrix row and forget its entry."""
+        scope = self._scopes[row]
+        rows = self._rows_by_scope[scope]
+        rows.remove(row)
+        if not rows:
+            del self._rows_by_scope[scope]
+        self._scopes[row] = None
+        self._values[row] = None
+        del self._lru[row]
+        self._free_rows.append(row)
+
+    def clear(self):
+        """Remove all entries."""
+        self._matrix = None
+        self._scopes = [None] * self.maxsize
+        self._values = [None] * self.maxsize
+        self._rows_by_scope.clear()
+        self._lru.clear()
+        self._free_rows = list(range(self.maxsize - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self._lru)
@@ -2,12 +2,18 @@
 Utility classes and functions for the shipment tracking application.
 """
 
-import threading
-import time
+import asyncio
+import sys
+from typing import Optional
+
+
+_CLEAR_LINE = b"\r" + b" " * 80 + b"\r"
 
 
 class Spinner:
-    """A simple spinner animation for console output."""
+    """A simple spinner animation for console output, driven by the asyncio event loop."""
+    
+    __slots__ = ("message", "spinner_chars", "running", "task", "_stopped")
     
     def __init__(self, message: str = "Processing"):
         """
@@ -19,29 +25,43 @@ class Spinner:
         self.message = message
         self.spinner_chars = ['-', '\\', '|', '/']
         self.running = False
-        self.thread = None
+        self.task: Optional[asyncio.Task] = None
+        self._stopped = asyncio.Event()
+    
+    def _write(self, data: bytes):
+        """Write raw bytes to stdout with a single flush."""
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
     
-    def _spin(self):
-        """Internal method to handle the spinning animation."""
+    async def _spin(self):
+        """Internal coroutine to handle the spinning animation."""
+        # Encode every frame once up front so each tick is a single write
+        frames = [f"\r{self.message}... {char}".encode() for char in self.spinner_chars]
         i = 0
-        while self.running:
-            char = self.spinner_chars[i % len(self.spinner_chars)]
-            print(f"\r{self.message}... {char}", end="", flush=True)
-            time.sleep(0.1)
-            i += 1
+        while True:
+            self._write(frames[i % len(frames)])
+            # Wait for the next frame, or return as soon as stop() is called
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=0.1)
+                return
+            except TimeoutError:
+                i += 1
     
     def start(self):
-        """Start the spinner animation."""
+        """Start the spinner animation. Must be called from a running event loop."""
         if not self.running:
             self.running = True
-            self.thread = threading.Thread(target=self._spin, daemon=True)
-            self.thread.start()
+            self._stopped.clear()
+            self.task = asyncio.create_task(self._spin())
     
-    def stop(self):
+    async def stop(self):
         """Stop the spinner animation and clear the line."""
         if self.running:
             self.running = False
-            if self.thread:
-                self.thread.join(timeout=0.2)
+            self._stopped.set()
+            if self.task:
+                await self.task
+                self.task = None
             # Clear the spinner line more thoroughly
-            print(f"\r{' ' * 80}\r", end="", flush=True)
+            self._write(_CLEAR_LINE)
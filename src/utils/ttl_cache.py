@@ -0,0 +1,66 @@
+"""
+In-memory cache with least-recently-used eviction and per-entry expiry.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """A bounded cache whose entries expire a fixed time after they were stored."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries; the least recently used entry is evicted first
+            ttl: Time in seconds after which an entry expires
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key: The cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            The cached value, or the default
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entries if the cache is full.
+
+        Args:
+            key: The cache key
+            value: The value to store
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,160 @@
+"""
+Tests for ShipmentTrackingAgent.chat_stream and its response cache, run against a fake ChatCompletionAgent.
+"""
+
+import asyncio
+import gc
+import os
+import sys
+import unittest
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from semantic_kernel.agents import AgentResponseItem
+from semantic_kernel.contents import ChatMessageContent, FunctionResultContent, StreamingChatMessageContent
+
+import agent as agent_module
+from agent import ShipmentTrackingAgent
+from filters import verbose_function_logging
+
+
+class FakeAgent:
+    """Stands in for ChatCompletionAgent and streams a fixed reply."""
+
+    name = "ShipmentTrackingAgent"
+
+    def __init__(self, chunks, tool_result=None):
+        self.chunks = chunks
+        self.tool_result = tool_result
+        self.calls = 0
+        self.verbose_flags = []
+
+    async def invoke_stream(self, messages, thread, on_intermediate_message=None):
+        self.calls += 1
+        await thread.on_new_message(ChatMessageContent(role="user", content=messages))
+        if self.tool_result is not None and on_intermediate_message is not None:
+            await on_intermediate_message(ChatMessageContent(
+                role="tool",
+                items=[FunctionResultContent(id="call", function_name="track_package", result=self.tool_result)]
+            ))
+        for chunk in self.chunks:
+            await asyncio.sleep(0)
+            self.verbose_flags.append(verbose_function_logging.get())
+            yield AgentResponseItem(
+                message=StreamingChatMessageContent(role="assistant", content=chunk, choice_index=0),
+                thread=thread
+            )
+        await thread.on_new_message(ChatMessageContent(role="assistant", content="".join(self.chunks)))
+
+
+def make_agent(chunks, verbose_mode=False, tool_result=None) -> ShipmentTrackingAgent:
+    """Create an agent backed by a FakeAgent, without building the shared kernel."""
+    agent = ShipmentTrackingAgent.__new__(ShipmentTrackingAgent)
+    agent.verbose_mode = verbose_mode
+    agent.agent = FakeAgent(chunks, tool_result)
+    agent.thread = None
+    return agent
+
+
+async def collect(agent: ShipmentTrackingAgent, user_message: str) -> str:
+    """Consume chat_stream and return the whole reply."""
+    return "".join([chunk async for chunk in agent.chat_stream(user_message)])
+
+
+class TrackingIdRuleTest(unittest.TestCase):
+    """Both response caches recognize tracking IDs the same way."""
+
+    def test_plain_tracking_requests_are_keyed_by_tracking_id(self):
+        for message in ("track PKG123456789", "Please track my package pkg123456789.", "track shipment PKG123456789!"):
+            with self.subTest(message=message):
+                self.assertEqual(agent_module._response_cache_key(message)[0], "PKG123456789")
+
+    def test_other_messages_have_no_cache_key(self):
+        for message in ("track 5", "Track my parcel 2", "track ABCDEFGH", "track PKG123456789 and PKG987654321"):
+            with self.subTest(message=message):
+                self.assertIsNone(agent_module._response_cache_key(message))
+
+    def test_semantic_scope_uses_the_same_rule(self):
+        self.assertEqual(
+            agent_module._semantic_cache_scope("Where are pkg987654321, PKG123456789 and parcel 2?"),
+            ("PKG123456789", "PKG987654321")
+        )
+        self.assertIsNone(agent_module._semantic_cache_scope("Where is parcel 2?"))
+
+
+class ChatStreamResponseCacheTest(unittest.IsolatedAsyncioTestCase):
+    """Plain tracking requests are answered from the shared response cache."""
+
+    def setUp(self):
+        agent_module._response_cache.clear()
+        self.addCleanup(agent_module._response_cache.clear)
+
+    async def test_answer_from_a_fresh_conversation_is_reused(self):
+        first = make_agent(["In ", "transit."])
+        self.assertEqual(await collect(first, "track PKG123456789"), "In transit.")
+
+        second = make_agent(["Something else."])
+        reply = await collect(second, "Track pkg123456789")
+
+        self.assertEqual(reply, "In transit.")
+        self.assertEqual(second.agent.calls, 0)
+        # The cached exchange is still recorded in the conversation
+        messages = [message.content async for message in second.thread.get_messages()]
+        self.assertEqual(messages, ["Track pkg123456789", "In transit."])
+
+    async def test_answer_from_a_later_turn_is_not_stored(self):
+        agent = make_agent(["In ", "transit."])
+        await collect(agent, "hello")
+        await collect(agent, "track PKG123456789")
+
+        self.assertEqual(len(agent_module._response_cache), 0)
+
+    async def test_answer_built_on_a_failed_lookup_is_not_stored(self):
+        agent = make_agent(["Sorry."], tool_result={"error": "timeout"})
+        await collect(agent, "track PKG123456789")
+
+        self.assertEqual(len(agent_module._response_cache), 0)
+
+    async def test_verbose_mode_bypasses_the_cache(self):
+        await collect(make_agent(["In ", "transit."]), "track PKG123456789")
+
+        agent = make_agent(["Fresh answer."], verbose_mode=True)
+        reply = await collect(agent, "track PKG123456789")
+
+        self.assertEqual(reply, "Fresh answer.")
+        self.assertEqual(agent.agent.calls, 1)
+
+
+class ChatStreamVerboseFlagTest(unittest.IsolatedAsyncioTestCase):
+    """The verbose flag is only set while waiting for the next chunk."""
+
+    async def test_flag_is_set_for_the_agent_only(self):
+        agent = make_agent(["Your ", "package ", "is here."], verbose_mode=True)
+
+        async for _ in agent.chat_stream("hello"):
+            self.assertFalse(verbose_function_logging.get())
+
+        self.assertEqual(agent.agent.verbose_flags, [True, True, True])
+
+    async def test_breaking_out_without_closing_is_safe(self):
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        agent = make_agent(["Your ", "package ", "is here."], verbose_mode=True)
+
+        async for _ in agent.chat_stream("hello"):
+            break
+
+        self.assertFalse(verbose_function_logging.get())
+
+        # Let the event loop finalize the abandoned generator
+        gc.collect()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        gc.collect()
+
+        self.assertEqual(errors, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
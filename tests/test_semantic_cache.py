@@ -0,0 +1,110 @@
+"""
+Tests for the embedding similarity cache.
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import SemanticCache
+
+
+class SemanticCacheTest(unittest.TestCase):
+    """Exercise matching, eviction and expiry of SemanticCache."""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("utils.semantic_cache.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = SemanticCache(maxsize=2, ttl=60, threshold=0.9)
+
+    def test_similar_query_matches(self):
+        self.cache.set("PKG1", [1.0, 0.0], "a")
+
+        self.assertEqual(self.cache.get("PKG1", [0.99, 0.05]), "a")
+        self.assertIsNone(self.cache.get("PKG1", [0.5, 0.5]))
+
+    def test_scopes_are_isolated(self):
+        self.cache.set("PKG1", [1.0, 0.0], "a")
+
+        self.assertIsNone(self.cache.get("PKG2", [1.0, 0.0]))
+        self.assertEqual(self.cache.get("PKG2", [1.0, 0.0], default="miss"), "miss")
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set("PKG1", [1.0, 0.0], "a")
+        self.cache.set("PKG2", [1.0, 0.0], "b")
+        self.cache.get("PKG1", [1.0, 0.0])
+        self.cache.set("PKG3", [1.0, 0.0], "c")
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.get("PKG1", [1.0, 0.0]), "a")
+        self.assertIsNone(self.cache.get("PKG2", [1.0, 0.0]))
+        self.assertEqual(self.cache.get("PKG3", [1.0, 0.0]), "c")
+
+    def test_entries_expire(self):
+        self.cache.set("PKG1", [1.0, 0.0], "a")
+        self.now += 61
+
+        self.assertIsNone(self.cache.get("PKG1", [1.0, 0.0]))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_expired_rows_are_reused(self):
+        self.cache.set("PKG1", [1.0, 0.0], "a")
+        self.cache.set("PKG2", [1.0, 0.0], "b")
+        self.now += 61
+        self.cache.set("PKG1", [0.0, 1.0], "c")
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.get("PKG1", [0.0, 1.0]), "c")
+        self.assertIsNone(self.cache.get("PKG1", [1.0, 0.0]))
+
+    def test_matching_query_replaces_its_entry(self):
+        self.cache.set("PKG1", [1.0, 0.0], "a")
+        self.cache.set("PKG1", [0.99, 0.05], "b")
+        self.cache.set("PKG2", [1.0, 0.0], "c")
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.get("PKG1", [1.0, 0.0]), "b")
+        self.assertEqual(self.cache.get("PKG2", [1.0, 0.0]), "c")
+
+    def test_replacing_an_entry_refreshes_its_expiry(self):
+        self.cache.set("PKG1", [1.0, 0.0], "a")
+        self.now += 50
+        self.cache.set("PKG1", [1.0, 0.0], "b")
+        self.now += 50
+
+        self.assertEqual(self.cache.get("PKG1", [1.0, 0.0]), "b")
+
+    def test_dimension_change_clears_the_cache(self):
+        self.cache.set("PKG1", [1.0, 0.0], "a")
+
+        self.assertIsNone(self.cache.get("PKG1", [1.0, 0.0, 0.0]))
+
+        self.cache.set("PKG2", [1.0, 0.0, 0.0], "b")
+
+        self.assertEqual(len(self.cache), 1)
+        self.assertIsNone(self.cache.get("PKG1", [1.0, 0.0, 0.0]))
+        self.assertEqual(self.cache.get("PKG2", [1.0, 0.0, 0.0]), "b")
+
+    def test_clear_removes_all_entries(self):
+        self.cache.set("PKG1", [1.0, 0.0], "a")
+        self.cache.set("PKG2", [1.0, 0.0], "b")
+        self.cache.clear()
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.get("PKG1", [1.0, 0.0]))
+
+        # All rows are free again
+        self.cache.set("PKG3", [1.0, 0.0], "c")
+        self.cache.set("PKG4", [1.0, 0.0], "d")
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.get("PKG3", [1.0, 0.0]), "c")
+
+
+if __name__ == "__main__":
+    unittest.main()
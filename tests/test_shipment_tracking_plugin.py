@@ -0,0 +1,93 @@
+"""
+Tests for the request coalescing in ShipmentTrackingPlugin.track_package.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+from aiohttp import web
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plugins import ShipmentTrackingPlugin
+
+
+class TrackPackageCoalescingTest(unittest.IsolatedAsyncioTestCase):
+    """Run track_package against a slow local tracking API."""
+
+    async def asyncSetUp(self):
+        self.request_count = 0
+        self.release = asyncio.Event()
+
+        async def lookup(request: web.Request) -> web.Response:
+            self.request_count += 1
+            await self.release.wait()
+            return web.json_response({"packages": [{"trackingId": request.query["trackingId"]}]})
+
+        app = web.Application()
+        app.router.add_get("/api/v2/package/lookup", lookup)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        self.plugin = ShipmentTrackingPlugin(base_url=f"http://127.0.0.1:{port}", use_simulation=False)
+
+    async def asyncTearDown(self):
+        self.release.set()
+        await self.plugin.close()
+        await self.runner.cleanup()
+
+    async def _wait_for_request(self):
+        while self.request_count == 0:
+            await asyncio.sleep(0.01)
+
+    async def test_concurrent_identical_lookups_share_one_request(self):
+        first = asyncio.create_task(self.plugin.track_package("PKG123456789"))
+        second = asyncio.create_task(self.plugin.track_package("pkg123456789"))
+        await self._wait_for_request()
+        self.release.set()
+
+        results = await asyncio.gather(first, second)
+
+        self.assertEqual(self.request_count, 1)
+        self.assertEqual(results[0], {"packages": [{"trackingId": "PKG123456789"}]})
+        self.assertEqual(results[0], results[1])
+
+    async def test_cancelling_the_first_caller_does_not_cancel_the_others(self):
+        owner = asyncio.create_task(self.plugin.track_package("PKG123456789"))
+        await self._wait_for_request()
+        follower = asyncio.create_task(self.plugin.track_package("PKG123456789"))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await owner
+        self.release.set()
+        result = await follower
+
+        self.assertFalse(follower.cancelled())
+        self.assertEqual(result, {"packages": [{"trackingId": "PKG123456789"}]})
+        self.assertEqual(self.request_count, 1)
+
+    async def test_cancelled_lookup_still_fills_the_cache(self):
+        caller = asyncio.create_task(self.plugin.track_package("PKG123456789"))
+        await self._wait_for_request()
+        caller.cancel()
+        self.release.set()
+
+        # Wait for the shared lookup to finish in the background
+        while self.plugin._in_flight:
+            await asyncio.sleep(0.01)
+        result = await self.plugin.track_package("PKG123456789")
+
+        self.assertEqual(result, {"packages": [{"trackingId": "PKG123456789"}]})
+        self.assertEqual(self.request_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Tests for the LRU cache with per-entry expiry.
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import TTLCache
+
+
+class TTLCacheTest(unittest.TestCase):
+    """Exercise expiry and eviction of TTLCache."""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("utils.ttl_cache.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = TTLCache(maxsize=2, ttl=60)
+
+    def test_stored_value_is_returned(self):
+        self.cache.set("a", 1)
+
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("b", default=0), 0)
+
+    def test_entries_expire(self):
+        self.cache.set("a", 1)
+        self.now += 59
+        self.assertEqual(self.cache.get("a"), 1)
+
+        self.now += 1
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_setting_a_key_again_refreshes_its_expiry(self):
+        self.cache.set("a", 1)
+        self.now += 50
+        self.cache.set("a", 2)
+        self.now += 50
+
+        self.assertEqual(self.cache.get("a"), 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("c"), 3)
+
+    def test_clear_removes_all_entries(self):
+        self.cache.set("a", 1)
+        self.cache.clear()
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()